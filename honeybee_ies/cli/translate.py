@@ -6,9 +6,6 @@ import logging
 import json
 
 from ladybug.commandutil import process_content_to_output
-from honeybee.model import Model
-from honeybee_ies.writer import model_to_gem as model_to_gem_str
-from honeybee_ies.reader import model_from_ies
 
 _logger = logging.getLogger(__name__)
 
@@ -37,7 +34,11 @@ def translate():
     '--output-file', '-o', help='Optional GEM file path to output the GEM string '
     'of the translation. By default this will be printed out to stdout.',
     type=click.File('w'), default='-', show_default=True)
-def model_to_gem_cli(model_file, shade_thickness, name, folder, output_file):
+@click.option(
+    '--cpu-count', '-cc', help='Number of processes to be used for translating the '
+    'rooms of the model. Using more than one process is only helpful for models '
+    'with many rooms.', type=click.INT, default=1, show_default=True)
+def model_to_gem_cli(model_file, shade_thickness, name, folder, output_file, cpu_count):
     """Translate a Model JSON file to an IES GEM file.
     \b
 
@@ -49,7 +50,7 @@ def model_to_gem_cli(model_file, shade_thickness, name, folder, output_file):
             if not name.lower().endswith('.gem'):
                 name = name + '.gem'
             output_file = os.path.join(folder, name)
-        model_to_gem(model_file, shade_thickness, output_file)
+        model_to_gem(model_file, shade_thickness, output_file, cpu_count)
     except Exception as e:
         _logger.exception('Model translation failed.\n{}'.format(e))
         sys.exit(1)
@@ -57,7 +58,7 @@ def model_to_gem_cli(model_file, shade_thickness, name, folder, output_file):
         sys.exit(0)
 
 
-def model_to_gem(model_file, shade_thickness=0, output_file=None):
+def model_to_gem(model_file, shade_thickness=0, output_file=None, cpu_count=1):
     """Translate a Model JSON file to an IES GEM file.
 
     Args:
@@ -68,9 +69,16 @@ def model_to_gem(model_file, shade_thickness=0, output_file=None):
             extrudes the geometry to create a closed volume for the shade. (Default: 0).
         output_file: Optional GEM file path to output the GEM string of the
             translation. If None, the string will be returned from this function.
+        cpu_count: Number of processes to be used for translating the rooms of
+            the model. (Default: 1).
     """
+    # import the translators here to keep the CLI start-up fast
+    from honeybee.model import Model
+    from honeybee_ies.writer import model_to_gem as model_to_gem_str
+
     model = Model.from_file(model_file)
-    gem_str = model_to_gem_str(model, shade_thickness=shade_thickness)
+    gem_str = model_to_gem_str(
+        model, shade_thickness=shade_thickness, cpu_count=cpu_count)
     return process_content_to_output(gem_str, output_file)
 
 
@@ -87,7 +95,11 @@ def model_to_gem(model_file, shade_thickness=0, output_file=None):
     '--output-file', '-o', help='Optional HBJSON file path to output the HBJSON string '
     'of the translation. By default this will be printed out to stdout.',
     type=click.File('w'), default='-', show_default=True)
-def gem_to_model_cli(gem_file, name, folder, output_file):
+@click.option(
+    '--cpu-count', '-cc', help='Number of processes to be used for parsing the '
+    'objects in the GEM file. Using more than one process is only helpful for '
+    'large GEM files.', type=click.INT, default=1, show_default=True)
+def gem_to_model_cli(gem_file, name, folder, output_file, cpu_count):
     """Translate an IES GEM file to a HBJSON model.
     \b
 
@@ -100,7 +112,7 @@ def gem_to_model_cli(gem_file, name, folder, output_file):
             if not low_name.endswith('.hbjson') and not low_name.endswith('.json'):
                 name = name + '.hbjson'
             output_file = os.path.join(folder, name)
-        gem_to_model(gem_file, output_file)
+        gem_to_model(gem_file, output_file, cpu_count)
     except Exception as e:
         _logger.exception('Model translation failed.\n{}'.format(e))
         sys.exit(1)
@@ -108,14 +120,19 @@ def gem_to_model_cli(gem_file, name, folder, output_file):
         sys.exit(0)
 
 
-def gem_to_model(gem_file, output_file=None):
+def gem_to_model(gem_file, output_file=None, cpu_count=1):
     """Translate an IES GEM file to a HBJSON model.
 
     Args:
         gem_file: Full path to an IES VE GEM file.
         output_file: Optional HBJSON file path to output the JSON string of the
             translation. If None, the string will be returned from this function.
+        cpu_count: Number of processes to be used for parsing the objects in the
+            GEM file. (Default: 1).
     """
-    model = model_from_ies(gem_file)
+    # import the translator here to keep the CLI start-up fast
+    from honeybee_ies.reader import model_from_ies
+
+    model = model_from_ies(gem_file, cpu_count=cpu_count)
     content_str = json.dumps(model.to_dict())
     return process_content_to_output(content_str, output_file)
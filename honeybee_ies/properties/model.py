@@ -46,6 +46,9 @@ class ModelIESProperties(object):
 
         # perform checks for duplicate identifiers, which might mess with other checks
         msgs.append(self.host.check_all_duplicate_identifiers(False, detailed))
+        if raise_exception and msgs[0]:
+            # no need to traverse the model for the rest of the checks
+            raise ValueError(msgs[0])
 
         # perform several checks for the Honeybee schema geometry rules
         msgs.append(self.host.check_planar(tol, False, detailed))
@@ -1,17 +1,21 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import itertools
 import math
+import mmap
+import os
 import pathlib
 import re
-from typing import Iterator, List, Tuple, Union, Dict
+from typing import Iterable, Iterator, List, Tuple, Union, Dict
 import uuid
 
 from ladybug_geometry.geometry3d import Face3D, Point3D, Vector3D, \
     Plane, Mesh3D
 from ladybug_geometry.geometry2d import Polygon2D, Point2D, Vector2D
-from ladybug_geometry.geometry2d.polygon import closest_point2d_on_line2d
 from honeybee.model import Model, Shade, Room, Face, Aperture, Door, \
     AirBoundary, ShadeMesh
 from honeybee.boundarycondition import Outdoors, Ground
-from honeybee.typing import clean_string, clean_and_id_ep_string
+from honeybee.typing import clean_string
 
 from .types import GEM_TYPES
 
@@ -20,18 +24,50 @@ PI = math.pi
 Z_AXIS = Vector3D(0, 0, 1)
 ROOF_ANGLE_TOLERANCE = math.radians(10)
 MODEL_TOLERANCE = 0.001
+# kinds of the objects that are parsed from GEM segments
+_ROOMS, _SHADES, _SHADE_MESHES = 'rooms', 'shades', 'shade_meshes'
+# random prefix and counter for generating unique identifiers for imported objects
+_ID_PREFIX = uuid.uuid4().hex
+_ID_COUNTER = itertools.count()
+# patterns for reading the object type from the header of GEM segments
+_TYPE_PATTERN = re.compile(r'^TYPE\n(\d*)', re.MULTILINE)
+_SUBTYPE_PATTERN = re.compile(r'^SUBTYPE\n(\d*)', re.MULTILINE)
+_CATEGORY_PATTERN = re.compile(r'^CATEGORY\n(\d*)', re.MULTILINE)
+# pattern for the line that starts the geometry of GEM objects after the header
+_KEYWORD_PATTERN = re.compile(r'\n(IES|LAN|PVP) ')
+# pattern for the VE ID at the end of the display names: Room 1 [RM000001]
+_ID_PATTERN = re.compile(r'\s\[(.*)\]$', re.MULTILINE)
 
 
 def _gem_object_type(info: str, keyword: str = 'IES') -> GEM_TYPES:
     """Get GEM object type from info."""
-    type_ = int(re.findall(r'^TYPE\n(\d*)', info, re.MULTILINE)[0])
-    subtype = int(re.findall(r'^SUBTYPE\n(\d*)', info, re.MULTILINE)[0])
-    category = int(re.findall(r'^CATEGORY\n(\d*)', info, re.MULTILINE)[0])
+    type_ = int(_TYPE_PATTERN.search(info).group(1))
+    subtype = int(_SUBTYPE_PATTERN.search(info).group(1))
+    category = int(_CATEGORY_PATTERN.search(info).group(1))
     return GEM_TYPES.from_info(
         category=category, type_=type_, subtype=subtype, keyword=keyword
     )
 
 
+def _new_id() -> str:
+    """Get a new unique identifier for an imported object.
+
+    The identifiers share a random prefix and end with an incremental hexadecimal
+    counter which is considerably faster than generating a new UUID per object.
+    """
+    return f'{_ID_PREFIX}-{next(_ID_COUNTER):x}'
+
+
+def _clean_and_id(display_name: str) -> str:
+    """Get a clean identifier with 8 unique characters from a display name.
+
+    This returns the same result as clean_and_id_ep_string(clean_string(display_name))
+    without cleaning the string twice. The output of clean_string is already a valid
+    EnergyPlus string.
+    """
+    return f'{clean_string(display_name)[:50]}_{str(uuid.uuid4())[:8]}'
+
+
 def _add_user_date(face: Union[Face, Shade], user_data: Dict):
     """Add user data to a face or a shade object."""
     if not user_data:
@@ -49,9 +85,9 @@ def _get_id(display_name):
     In version 2023 the ID is included in the GEM file as inside [] at the end of the
     name.
     """
-    id_ = re.findall(r'\s\[(.*)\]$', display_name, re.MULTILINE)
+    id_ = _ID_PATTERN.search(display_name)
     if id_:
-        return id_[0]
+        return id_.group(1)
     else:
         return None
 
@@ -75,40 +111,181 @@ def _update_name(obj: Union[Shade, Room], display_name: str, count: int = None):
 
 
 def _create_shade(
-        boundary: List[Point3D], holes: List[Point3D] = None,
-        is_detached: bool = True, user_data: Dict = None):
+        geometry: Face3D, is_detached: bool = True, user_data: Dict = None):
     """Create a Honeybee Shade object"""
-    geometry = Face3D(boundary, holes=holes)
     face = Shade(
-        str(uuid.uuid4()), geometry=geometry,
+        _new_id(), geometry=geometry,
         is_detached=is_detached
     )
     _add_user_date(face, user_data)
     return face
 
 
-def _opening_from_ies(geometry: Face3D, content: Iterator) -> Tuple[List[Point3D], int]:
-    """Translate an opening from gem format.
+def _closest_point_on_segment(
+        x: float, y: float, segment: Tuple[float, float, float, float, float]
+) -> Tuple[float, float]:
+    """Get the closest point on a segment to a point.
 
     Args:
-        parent_geo: Geometry of the parent object.
-        content: A GEM string
+        x: X coordinate of the point.
+        y: Y coordinate of the point.
+        segment: A tuple of (x, y, v_x, v_y, v_sq) for the start point of the segment,
+            the segment vector and the squared length of the vector.
 
     Returns:
-        opening_geos: A list of Face3D geometries for openings.
-        opening_type: An integer between 0-2. 0 for apertures, 1 for doors and 2 for
-            holes.
+        A tuple with the X and Y coordinates of the closest point.
+    """
+    s_x, s_y, v_x, v_y, v_sq = segment
+    u = ((x - s_x) * v_x + (y - s_y) * v_y) / v_sq if v_sq else 0
+    u = 0 if u < 0 else 1 if u > 1 else u
+    return s_x + u * v_x, s_y + u * v_y
+
+
+def _xy_to_xyz(plane: Plane, points: Iterable[Point2D]) -> List[Point3D]:
+    """Get a list of Point3D from a list of Point2D in the coordinate system of a plane.
+
+    This returns the same result as calling plane.xy_to_xyz for each point but reads
+    the components of the plane only once.
+    """
+    (o_x, o_y, o_z), (x_x, x_y, x_z), (y_x, y_y, y_z) = \
+        plane.o.to_array(), plane.x.to_array(), plane.y.to_array()
+    return [
+        Point3D(
+            o_x + x_x * pt.x + y_x * pt.y,
+            o_y + x_y * pt.x + y_y * pt.y,
+            o_z + x_z * pt.x + y_z * pt.y
+        )
+        for pt in points
+    ]
+
+
+def _are_polygons_apart(polygon: Polygon2D, other: Polygon2D, tolerance: float) -> bool:
+    """Check if the vertices of two polygons are farther than tolerance from the other.
+    """
+    for segment in polygon.segments:
+        for pt in other.vertices:
+            if segment.distance_to_point(pt) <= tolerance:
+                return False
+    for segment in other.segments:
+        for pt in polygon.vertices:
+            if segment.distance_to_point(pt) <= tolerance:
+                return False
+    return True
+
+
+def _are_holes_inside(
+        boundary: Polygon2D, holes: List[Polygon2D], tolerance: float) -> bool:
+    """Check if all the holes are inside a boundary and apart from each other.
+
+    Holes that touch the boundary or each other must be snapped and subtracted from
+    the boundary. Other holes can be added to the face directly.
     """
+    for count, hole in enumerate(holes):
+        if not boundary.is_polygon_inside(hole) or \
+                not _are_polygons_apart(boundary, hole, tolerance):
+            return False
+        for other in holes[count + 1:]:
+            if not hole.is_polygon_outside(other) or \
+                    not other.is_polygon_outside(hole) or \
+                    not _are_polygons_apart(hole, other, tolerance):
+                return False
+    return True
+
+
+def _opening_base(geometry: Face3D) -> Tuple[Point2D, List[Tuple], List[Tuple]]:
+    """Get the origin, the boundary segments and the offset segments for openings.
+
+    These values are shared between all the openings of the same parent face.
+
+    Args:
+        geometry: Geometry of the parent object.
 
-    if geometry.plane.n.z in (1, -1):
+    Returns:
+        A tuple with 3 items.
+
+        -   origin_2d: The 2D origin of the openings in the plane of the parent
+            geometry.
+        -   boundary_segments: A list of the parent boundary segments as tuples of
+            numbers. Each item is (min_x, min_y, max_x, max_y, x, y, v_x, v_y, v_sq)
+            where the min and max values are the bounding box of the segment
+            expanded by the snapping tolerance, x and y are the start point of the
+            segment, v_x and v_y are the segment vector and v_sq is the squared
+            length of the vector. Vertices outside the bounding box can't be
+            snapped to the segment.
+        -   offset_segments: An empty list for the segments of the parent boundary
+            offset by the snapping tolerance. Offsetting the boundary is only needed
+            for snapping vertices in the corners and the list is filled by
+            _opening_from_ies the first time it is needed.
+    """
+    tolerance = MODEL_TOLERANCE * 5
+    plane = geometry.plane
+    if plane.n.z in (1, -1):
         # horizontal faces
         origin = geometry.upper_right_corner
     else:
         origin = geometry.lower_left_corner
+    origin_2d = plane.xyz_to_xy(origin)
+    boundary_2d = geometry.boundary_polygon2d
+    boundary_segments = []
+    for segment in boundary_2d.segments:
+        p1, p2, v = segment.p1, segment.p2, segment.v
+        boundary_segments.append((
+            min(p1.x, p2.x) - tolerance, min(p1.y, p2.y) - tolerance,
+            max(p1.x, p2.x) + tolerance, max(p1.y, p2.y) + tolerance,
+            p1.x, p1.y, v.x, v.y, v.x * v.x + v.y * v.y
+        ))
+    return origin_2d, boundary_segments, []
+
+
+def _offset_segments(geometry: Face3D, tolerance: float) -> List[Tuple]:
+    """Get the segments of a face boundary offset by tolerance in the face plane.
+
+    Each item is a tuple of (x, y, v_x, v_y, v_sq) for the start point of the segment,
+    the segment vector and the squared length of the vector.
+    """
+    offset_segments = []
+    for segment in geometry.boundary_polygon2d.offset(tolerance).segments:
+        p1, v = segment.p1, segment.v
+        offset_segments.append((p1.x, p1.y, v.x, v.y, v.x * v.x + v.y * v.y))
+    return offset_segments
+
+
+def _opening_from_ies(
+    geometry: Face3D, origin_2d: Point2D, boundary_segments: List[Tuple],
+    offset_segments: List[Tuple], content: List[str], index: int
+        ) -> Tuple[int, List[Point3D], Polygon2D, float, int]:
+    """Translate an opening from gem format.
+
+    Args:
+        geometry: Geometry of the parent object.
+        origin_2d: Origin of the opening vertices in the plane of the parent geometry.
+        boundary_segments: A list of the boundary segments of the parent geometry
+            with their expanded bounding boxes.
+        offset_segments: A list of the segments of the parent geometry boundary
+            offset by the snapping tolerance. The list is filled in place if it is
+            empty and a vertex must be snapped in a corner. Use _opening_base to get
+            origin_2d, boundary_segments and offset_segments.
+        content: A list of the non-empty lines in the GEM segment.
+        index: Index of the line in content where the opening starts.
+
+    Returns:
+        A tuple with 5 items.
 
+        -   opening_type: An integer between 0-2. 0 for apertures, 1 for doors and 2 for
+            holes.
+        -   opening_vertices: A list of Point3D for the opening vertices.
+        -   opening_polygon_2d: A Polygon2D for the opening in the plane of the
+            parent geometry. This is only calculated for holes and it is None for
+            the other opening types.
+        -   opening_area: Area of the opening. This is only calculated for holes and
+            it is 0 for the other opening types.
+        -   index: Index of the first line in content after this opening.
+    """
+    plane = geometry.plane
     # This is how the next line looks
     # 5 2
-    ver_count, opening_type = [int(float(v)) for v in next(content).split()]
+    ver_count, opening_type = [int(float(v)) for v in content[index].split()]
+    index += 1
 
     # calculate the vertices from X, Y values
     # 0.000000     0.906100
@@ -116,64 +293,79 @@ def _opening_from_ies(geometry: Face3D, content: Iterator) -> Tuple[List[Point3D
     # 10.373100     0.000000
     tolerance = MODEL_TOLERANCE * 5
     boundary_2d: Polygon2D = geometry.boundary_polygon2d
-    offset_boundary_2d = boundary_2d.offset(tolerance)
-    origin_2d = geometry.plane.xyz_to_xy(origin)
+    # bind the values and methods that are used in the loop to local names
+    origin_x, origin_y = origin_2d.x, origin_2d.y
+    is_point_inside = boundary_2d.is_point_inside_check
+    tolerance_sq = tolerance * tolerance
 
-    # create vertices in 2D
-    opening_vertices = []
+    # create vertices in 2D. translucent shades have a third value for opacity
+    # which is ignored here.
     opening_vertices_2d = []
-    for _ in range(ver_count):
-        cnt = next(content).split()
-        if len(cnt) == 2:
-            x_m, y_m = [float(v) for v in cnt]
-        elif len(cnt) == 3:
-            # Translucent shade
-            x_m, y_m, opacity = [float(v) for v in cnt]
-        vertex_2d = Point2D(origin_2d.x - x_m, origin_2d.y - y_m)
-        vertex = geometry.plane.xy_to_xyz(vertex_2d)
+    for cnt in content[index:index + ver_count]:
+        cnt = cnt.split()
+        x, y = origin_x - float(cnt[0]), origin_y - float(cnt[1])
+        vertex_2d = Point2D(x, y)
         on_segments = []
-        for segment in boundary_2d.segments:
-            close_pt = closest_point2d_on_line2d(vertex_2d, segment)
-            if vertex_2d.distance_to_point(close_pt) <= tolerance:
-                on_segments.append((segment, close_pt))
+        for min_x, min_y, max_x, max_y, s_x, s_y, v_x, v_y, v_sq in boundary_segments:
+            if x < min_x or x > max_x or y < min_y or y > max_y:
+                # the vertex is too far from the segment
+                continue
+            # find the closest point on the segment and check its distance
+            u = ((x - s_x) * v_x + (y - s_y) * v_y) / v_sq if v_sq else 0
+            u = 0 if u < 0 else 1 if u > 1 else u
+            d_x, d_y = s_x + u * v_x - x, s_y + u * v_y - y
+            if d_x * d_x + d_y * d_y <= tolerance_sq:
+                on_segments.append((v_x, v_y))
+                if len(on_segments) > 2:
+                    # the vertex can't be snapped. no need to check other segments
+                    break
 
         if not on_segments or opening_type == 2:
             # for holes don't move the vertex
             pass
         elif len(on_segments) == 1:
-            # it is an edge
-            vector: Vector2D = on_segments[0][0].v
-            v1 = vector.rotate(PI / 2).normalize() * tolerance
-            v2 = vector.rotate(-PI / 2).normalize() * tolerance
+            # it is an edge. move the vertex perpendicular to the edge
+            v_x, v_y = on_segments[0]
+            v1 = Vector2D(-v_y, v_x)  # same as rotating by PI / 2
+            v1 = v1 * (tolerance / v1.magnitude)
             v = vertex_2d.move(v1)
-            if boundary_2d.is_point_inside_check(v):
+            if is_point_inside(v):
                 vertex_2d = v
             else:
-                v = vertex_2d.move(v2)
-                if boundary_2d.is_point_inside_check:
+                v = vertex_2d.move(v1.reverse())
+                if is_point_inside(v):
                     vertex_2d = v
         elif len(on_segments) == 2:
             # The point is adjacent to a corner. Find the closest point to the offset boundary
-            dist_col = []
-            for seg in offset_boundary_2d.segments:
-                cp = seg.closest_point(vertex_2d)
-                dist = cp.distance_to_point(vertex_2d)
-                dist_col.append([dist, cp])
-
-            points_sorted = sorted(dist_col, key=lambda x: x[0])
-            vertex_2d = points_sorted[0][1]
+            if not offset_segments:
+                # offset the boundary once and reuse it for the other openings
+                offset_segments.extend(_offset_segments(geometry, tolerance))
+            closest_pt, closest_dist = None, float('inf')
+            for seg in offset_segments:
+                c_x, c_y = _closest_point_on_segment(x, y, seg)
+                dist = (c_x - x) ** 2 + (c_y - y) ** 2  # squared distance
+                if dist < closest_dist:
+                    closest_pt, closest_dist = (c_x, c_y), dist
+            vertex_2d = Point2D(*closest_pt)
         else:
             # this should not happen!
+            vertex = plane.xy_to_xyz(vertex_2d)
             print(f'{vertex} is adjacent to more than 2 edges of the same polygon.')
 
-        vertex = geometry.plane.xy_to_xyz(vertex_2d)
-        opening_vertices.append(vertex)
         opening_vertices_2d.append(vertex_2d)
 
-    org_pl = Polygon2D(opening_vertices_2d)
-    opening_area = org_pl.area
+    # map all the vertices back to 3D at once
+    opening_vertices = _xy_to_xyz(plane, opening_vertices_2d)
 
-    return opening_type, opening_vertices, opening_vertices_2d, opening_area
+    if opening_type == 2:
+        opening_polygon_2d = Polygon2D(opening_vertices_2d)
+        opening_area = opening_polygon_2d.area
+    else:
+        # the polygon and the area are only used for holes
+        opening_polygon_2d, opening_area = None, 0
+
+    return opening_type, opening_vertices, opening_polygon_2d, opening_area, \
+        index + ver_count
 
 
 def _create_tree(info: str, tree_type=1) -> Shade:
@@ -205,7 +397,7 @@ def _create_tree(info: str, tree_type=1) -> Shade:
         geos.append(geometry)
 
     tree_0 = _create_shade(
-        geos[0].lower_left_counter_clockwise_vertices,
+        Face3D(geos[0].lower_left_counter_clockwise_vertices),
         user_data={
             '__gem_type__': 'tree',
             '__gem_tree_type__': tree_type,
@@ -214,7 +406,7 @@ def _create_tree(info: str, tree_type=1) -> Shade:
     )
 
     tree_1 = _create_shade(
-        geos[1].lower_left_counter_clockwise_vertices,
+        Face3D(geos[1].lower_left_counter_clockwise_vertices),
         user_data={
             '__gem_type__': 'tree',
             '__gem_tree_type__': tree_type
@@ -240,7 +432,7 @@ def _create_pv(info: str) -> Shade:
         geometry = geometry.rotate_xy(math.radians(xy_rotation), base)
 
     pv = _create_shade(
-        geometry.lower_left_counter_clockwise_vertices,
+        Face3D(geometry.lower_left_counter_clockwise_vertices),
         user_data={'__gem_type__': 'pv'}
     )
 
@@ -248,15 +440,22 @@ def _create_pv(info: str) -> Shade:
 
 
 def _parse_gem_segment(
-        segment: str, ignore_shade_mesh=False) -> Union[Room, ShadeMesh, Shade]:
+        segment: str, ignore_shade_mesh=False
+) -> Tuple[str, Union[List[Room], List[ShadeMesh], List[Shade]]]:
     """Parse a segment of the GEM file.
 
     Each segment has the information for a room or a shade object.
+
+    Returns:
+        A tuple with the kind of the parsed objects and a list of the objects. The
+        kind is one of _ROOMS, _SHADE_MESHES or _SHADES.
     """
-    for keyword in ['IES', 'LAN', 'PVP']:
-        if keyword in segment:
-            info, segments = re.split(f'\n{keyword} ', segment)
-            break
+    # find the line with the keyword and split the segment there
+    keyword_match = _KEYWORD_PATTERN.search(segment)
+    if keyword_match:
+        keyword = keyword_match.group(1)
+        info = segment[:keyword_match.start()]
+        segments = segment[keyword_match.end():]
     else:
         raise ValueError(
             'There is a segment with an unsupported type in the input GEM file. '
@@ -266,90 +465,117 @@ def _parse_gem_segment(
 
     gem_type = _gem_object_type(info=info, keyword=keyword)
 
-    # remove empty lines if any
-    content = iter(lin for lin in segments.split('\n') if lin.strip())
-    display_name = next(content)
-    cleaned_display_name = clean_string(display_name)
-    identifier = clean_and_id_ep_string(cleaned_display_name)
+    # remove empty lines if any and walk through the lines using an index
+    content = [lin for lin in segments.split('\n') if lin and not lin.isspace()]
+    display_name = content[0]
     if gem_type == GEM_TYPES.PV:
-        pv_info = next(content)
+        pv_info = content[1]
         face = _create_pv(pv_info)
         _update_name(face, display_name)
-        return [face]
+        return _SHADES, [face]
     elif gem_type == GEM_TYPES.Tree:
-        tree_type = next(content)
+        tree_type = content[1]
         assert tree_type.startswith('2D Tree'), \
             f'{tree_type} is not currently supported.'
         tree_type = int(tree_type.split()[-1])
-        tree_info = next(content)
+        tree_info = content[2]
         faces = _create_tree(tree_info, tree_type=tree_type)
         for count, face in enumerate(faces):
             _update_name(face, display_name, count)
-        return faces
+        return _SHADES, faces
 
     faces = []
     # everything else
-    ver_count, face_count = [int(v) for v in next(content).split()]
+    identifier = _clean_and_id(display_name)
+    ver_count, face_count = [int(v) for v in content[1].split()]
+    # parse all the vertex coordinates at once
+    index = 2 + ver_count
+    coordinates = iter(map(float, ' '.join(content[2:index]).split()))
     vertices = [
-        Point3D(*[float(v) for v in next(content).split()])
-        for _ in range(ver_count)
+        Point3D(x, y, z) for x, y, z in zip(coordinates, coordinates, coordinates)
     ]
 
     # create a shade mesh for shades with multiple faces
     if not ignore_shade_mesh \
         and gem_type == GEM_TYPES.ContextBuilding \
             and face_count > 1:
-        faces = []
+        # keep the mesh faces separate from the faces that are created below in case
+        # the segment can't be translated to a shade mesh
+        mesh_faces = []
+        mesh_index = index
         for _ in range(face_count):
-            boundary = tuple(int(i) - 1 for i in next(content).split()[1:])
-            opening_count = int(next(content))  # pass the line for the opening count
+            boundary = tuple(int(i) - 1 for i in content[mesh_index].split()[1:])
+            # pass the line for the opening count
+            opening_count = int(content[mesh_index + 1])
+            mesh_index += 2
             if opening_count > 0 or len(boundary) > 4:
                 # there is a hole in the shade or the face has more than 4 edges
-                # use the old method of using faces instead
-                return _parse_gem_segment(segment, True)
-            faces.append(boundary)
-        mesh_geometry = Mesh3D(vertices=vertices, faces=faces)
-        mesh = ShadeMesh(identifier=identifier, geometry=mesh_geometry, is_detached=True)
-        _update_name(mesh, display_name)
-        return mesh
-
+                # use the old method of using faces instead. The faces are read
+                # again below starting from the first face.
+                break
+            mesh_faces.append(boundary)
+        else:
+            mesh_geometry = Mesh3D(vertices=vertices, faces=mesh_faces)
+            mesh = ShadeMesh(
+                identifier=identifier, geometry=mesh_geometry, is_detached=True
+            )
+            _update_name(mesh, display_name)
+            return _SHADE_MESHES, [mesh]
+
+    # GEM vertex indices start from 1. add a placeholder to look them up directly
+    vertex_lookup = (None, *vertices)
+    # the type is the same for all the faces in the segment
+    is_space = gem_type == GEM_TYPES.Space
+    is_shade = gem_type in (
+        GEM_TYPES.ContextBuilding, GEM_TYPES.Shade, GEM_TYPES.Shade_2)
+    is_detached = gem_type == GEM_TYPES.ContextBuilding
     # create faces
     for _ in range(face_count):
         apertures = []
         doors = []
         holes = []
         holes_2d = []
-        boundary = [vertices[int(i) - 1] for i in next(content).split()[1:]]
+        boundary = [vertex_lookup[i] for i in map(int, content[index].split()[1:])]
         boundary_geometry = Face3D(boundary, enforce_right_hand=False)
         boundary_geometry_polygon2d = boundary_geometry.boundary_polygon2d
         boundary_area = boundary_geometry.area
         holes_area = 0
-        opening_count = int(next(content))
+        opening_count = int(content[index + 1])
+        index += 2
+        if opening_count:
+            origin_2d, boundary_segments, offset_segments = \
+                _opening_base(boundary_geometry)
         for _ in range(opening_count):
-            opening_type, opening_vertices, opening_vertices_2d, opening_area = \
-                _opening_from_ies(boundary_geometry, content)
+            opening_type, opening_vertices, opening_polygon_2d, opening_area, index = \
+                _opening_from_ies(
+                    boundary_geometry, origin_2d, boundary_segments,
+                    offset_segments, content, index
+                )
             if opening_type == 0:
                 # create an aperture
                 aperture_geo = Face3D(opening_vertices)
-                aperture = Aperture(str(uuid.uuid4()), aperture_geo)
+                aperture = Aperture(_new_id(), aperture_geo)
                 apertures.append(aperture)
             elif opening_type == 1:
                 # create a door
                 door_geo = Face3D(opening_vertices)
-                door = Door(str(uuid.uuid4()), door_geo)
+                door = Door(_new_id(), door_geo)
                 doors.append(door)
             elif opening_type == 2:
                 # create a hole
                 holes_area += opening_area
                 holes.append(opening_vertices)
-                holes_2d.append(Polygon2D(opening_vertices_2d))
+                holes_2d.append(opening_polygon_2d)
             else:
                 raise ValueError(f'Unsupported opening type: {opening_type}')
 
-        if gem_type == GEM_TYPES.Space:
+        # reuse the boundary geometry for the face unless its vertices must be
+        # reversed to be counterclockwise
+        geometry = Face3D(boundary) if boundary_geometry.is_clockwise \
+            else boundary_geometry
+        if is_space:
             # A model face
-            geometry = Face3D(boundary)
-            face = Face(str(uuid.uuid4()), geometry=geometry)
+            face = Face(_new_id(), geometry=geometry)
             if apertures or doors:
                 # change the boundary condition if it is set to ground
                 if isinstance(face.boundary_condition, Ground):
@@ -361,6 +587,7 @@ def _parse_gem_segment(
             face.add_apertures(apertures)
             face.add_doors(doors)
             if holes:
+                boundary_plane = boundary_geometry.plane
                 # add an AirBoundary to cover the hole
                 if holes_area >= 0.98 * boundary_area:
                     # the face is mostly created from holes
@@ -375,15 +602,39 @@ def _parse_gem_segment(
                         hole = boundary_geometry_polygon2d.snap_to_polygon(
                             hole, MODEL_TOLERANCE * 5)
                         # map the hole back to 3D
-                        hole = [boundary_geometry.plane.xy_to_xyz(ver) for ver in hole]
+                        hole = _xy_to_xyz(boundary_plane, hole)
                         hole_geo = Face3D(hole)
                         hole_face = Face(
-                            str(uuid.uuid4()), geometry=hole_geo, type=AirBoundary()
+                            _new_id(), geometry=hole_geo, type=AirBoundary()
                         )
                         faces.append(hole_face)
                     continue
 
                 # only part of the face is created from holes.
+                if _are_holes_inside(
+                        boundary_geometry_polygon2d, holes_2d, MODEL_TOLERANCE * 5):
+                    # the holes are inside the face and apart from each other.
+                    # add them to the face without snapping or a boolean difference.
+                    # the holes are clockwise similar to the output of the difference.
+                    normal = geometry.normal
+                    holes_3d = []
+                    for hole in holes:
+                        hole_geo = Face3D(hole)
+                        if hole_geo.normal.dot(normal) > 0:
+                            hole_geo = hole_geo.flip()
+                        holes_3d.append(hole_geo)
+                        hole_face = Face(
+                            _new_id(), geometry=hole_geo, type=AirBoundary()
+                        )
+                        hole_face.user_data = {'__ies_import__': True}
+                        faces.append(hole_face)
+                    base_face = Face3D(
+                        geometry.boundary, geometry.plane,
+                        holes=[hole_geo.vertices for hole_geo in holes_3d]
+                    )
+                    faces.append(Face(_new_id(), geometry=base_face))
+                    continue
+
                 # 1. try to snap them to the face
                 # 2. separate holes from side air boundaries
                 holes_2d_snapped = [
@@ -391,7 +642,7 @@ def _parse_gem_segment(
                     for hole in holes_2d
                 ]
                 holes_3d_snapped = [
-                    Face3D([boundary_geometry.plane.xy_to_xyz(v) for v in hole])
+                    Face3D(_xy_to_xyz(boundary_plane, hole))
                     for hole in holes_2d_snapped
                 ]
 
@@ -402,25 +653,34 @@ def _parse_gem_segment(
                     # change the base face to a list if the difference is a single face
                     base_faces = [base_faces]
                 base_faces_holes = [[] for _ in base_faces]
-                holes_tracker = []
-                for hole_count, hole_geo in enumerate(holes_3d_snapped):
-                    for count, base_face in enumerate(base_faces):
-                        if not base_face.holes:
-                            continue
-                        for f_hole in base_face.holes:
-                            f_hole_geo = Face3D(f_hole)
-                            if hole_geo.center.distance_to_point(f_hole_geo.center) <= \
-                                    MODEL_TOLERANCE * 5:
-                                # this hole is inside the face
-                                base_faces_holes[count].append(f_hole_geo)
-                                holes_tracker.append(hole_count)
-                                break
-                    else:
-                        if hole_count in holes_tracker:
+                # create the geometry of the holes in the base faces only once and
+                # keep their centers to match them against the snapped holes
+                f_holes = []
+                for count, base_face in enumerate(base_faces):
+                    if not base_face.holes:
+                        continue
+                    for f_hole in base_face.holes:
+                        f_hole_geo = Face3D(f_hole)
+                        center = f_hole_geo.center
+                        f_holes.append((count, f_hole_geo, center.x, center.y, center.z))
+                tolerance_sq = (MODEL_TOLERANCE * 5) ** 2
+                for hole_geo in holes_3d_snapped:
+                    center = hole_geo.center
+                    c_x, c_y, c_z = center.x, center.y, center.z
+                    matched_faces = set()
+                    for count, f_hole_geo, f_x, f_y, f_z in f_holes:
+                        if count in matched_faces:
+                            # only the first matching hole of each face is used
                             continue
+                        if (c_x - f_x) ** 2 + (c_y - f_y) ** 2 + (c_z - f_z) ** 2 <= \
+                                tolerance_sq:
+                            # this hole is inside the face
+                            base_faces_holes[count].append(f_hole_geo)
+                            matched_faces.add(count)
+                    if not matched_faces:
                         # the hole is not inside any of the faces
                         hole_face = Face(
-                            str(uuid.uuid4()), geometry=hole_geo, type=AirBoundary()
+                            _new_id(), geometry=hole_geo, type=AirBoundary()
                         )
                         faces.append(hole_face)
 
@@ -428,7 +688,7 @@ def _parse_gem_segment(
                 holes_flattened = [h for holes in base_faces_holes for h in holes]
                 for hole_geo in holes_flattened:
                     hole_face = Face(
-                        str(uuid.uuid4()), geometry=hole_geo, type=AirBoundary()
+                        _new_id(), geometry=hole_geo, type=AirBoundary()
                     )
                     # add a key to user data to skip the face when translating
                     # back from HBJSON to GEM
@@ -437,68 +697,93 @@ def _parse_gem_segment(
 
                 # add base faces
                 for base_face in base_faces:
-                    face = Face(str(uuid.uuid4()), geometry=base_face)
+                    face = Face(_new_id(), geometry=base_face)
                     faces.append(face)
                 continue
 
-        elif gem_type in (
-                GEM_TYPES.ContextBuilding, GEM_TYPES.Shade, GEM_TYPES.Shade_2):
-            is_detached = True if gem_type == GEM_TYPES.ContextBuilding else False
-            face = _create_shade(boundary, holes, is_detached)
+        elif is_shade:
+            shade_geometry = Face3D(boundary, holes=holes) if holes else geometry
+            face = _create_shade(shade_geometry, is_detached)
             _update_name(face, display_name)
         elif gem_type == GEM_TYPES.TranslucentShade:
             # ignore the hole. GEM has a strange way of building translucent shades
             face = _create_shade(
-                boundary=boundary, is_detached=False,
+                geometry=geometry, is_detached=False,
                 user_data={'__gem_type__': 'translucent_shade'}
             )
             _update_name(face, display_name)
         elif gem_type == GEM_TYPES.Topography:
             # Topography
+            shade_geometry = Face3D(boundary, holes=holes) if holes else geometry
             face = _create_shade(
-                boundary=boundary, holes=holes, is_detached=True,
+                geometry=shade_geometry, is_detached=True,
                 user_data={'__gem_type__': 'topography'}
             )
             _update_name(face, display_name)
 
         faces.append(face)
 
-    if gem_type == GEM_TYPES.Space:
+    if is_space:
         room = Room(identifier, faces=faces)
         _update_name(room, display_name)
-        return room
+        return _ROOMS, [room]
     else:
-        return faces
+        return _SHADES, faces
 
 
-def model_from_gem(
-    gem_str: str, model_id: str = 'Unnamed', model_name: str = None
-) -> Model:
-    """Create a Honeybee Model from the string contents of a VE GEM file.
+def _init_parser_process():
+    """Use a new identifier prefix in each parser process to avoid duplicate IDs."""
+    global _ID_PREFIX
+    _ID_PREFIX = uuid.uuid4().hex
+
+
+def _parse_gem_segments(segments: Iterable[str], cpu_count: int = 1) -> List:
+    """Parse the LAYER segments of a VE GEM file.
 
     Args:
-        gem_str: Text string representation of the contents of a GEM file.
-        model_id: Text string to be applied as the Model identifier. Typically,
-            this is derived from the GEM file name. (Default: Unnamed).
-        model_name: Text string to be applied as the Model identifier. If None,
-            this will be the same as the model_id. (Default: None).
+        segments: The LAYER segments of a GEM file.
+        cpu_count: Number of processes to be used for parsing the segments. If None,
+            all the available CPUs will be used. (Default: 1).
 
     Returns:
-        A Honeybee Model derived from the GEM file contents.
+        A list with a tuple of the kind and the parsed objects for each segment.
     """
+    if cpu_count is None:
+        cpu_count = os.cpu_count() or 1
+    if cpu_count > 1:
+        segments = list(segments)
+        workers = min(cpu_count, len(segments))
+        if workers > 1:
+            chunksize = max(1, len(segments) // (4 * workers))
+            try:
+                with ProcessPoolExecutor(
+                        max_workers=workers, initializer=_init_parser_process
+                ) as executor:
+                    return list(
+                        executor.map(_parse_gem_segment, segments, chunksize=chunksize)
+                    )
+            except (OSError, NotImplementedError, BrokenProcessPool) as error:
+                # processes are not available in this environment or a worker was
+                # terminated before the segments were parsed; parse them serially
+                print(
+                    f'Failed to parse the segments in parallel: {error!r}. '
+                    'Parsing them serially.'
+                )
+    return [_parse_gem_segment(segment) for segment in segments]
+
+
+def _model_from_segments(
+    segments: Iterable[str], model_id: str = 'Unnamed', model_name: str = None,
+    cpu_count: int = 1
+) -> Model:
+    """Create a Honeybee Model from the LAYER segments of a VE GEM file."""
     # parse the Rooms, Shades and ShadeMeshes
-    segments = gem_str.split('\nLAYER')[1:]
-    parsed_objects = [_parse_gem_segment(segment) for segment in segments]
-    rooms = []
-    shades = []
-    shade_meshes = []
-    for r in parsed_objects:
-        if isinstance(r, Room):
-            rooms.append(r)
-        elif isinstance(r, ShadeMesh):
-            shade_meshes.append(r)
-        else:
-            shades.extend(r)
+    parsed_objects = _parse_gem_segments(segments, cpu_count)
+    objects = {_ROOMS: [], _SHADES: [], _SHADE_MESHES: []}
+    for kind, parsed in parsed_objects:
+        objects[kind].extend(parsed)
+    rooms, shades, shade_meshes = \
+        objects[_ROOMS], objects[_SHADES], objects[_SHADE_MESHES]
 
     # create the Model
     model = Model(
@@ -510,17 +795,68 @@ def model_from_gem(
     return model
 
 
-def model_from_ies(gem: str) -> Model:
+def _gem_file_segments(gem_file: pathlib.Path) -> Iterator[str]:
+    """Get the LAYER segments of a GEM file one by one.
+
+    The file is memory-mapped and each segment is only decoded when it is requested
+    to avoid loading the full contents of the file in memory.
+    """
+    with gem_file.open('rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            needle = b'\nLAYER'
+            start = mm.find(needle)
+            while start != -1:
+                start += len(needle)
+                end = mm.find(needle, start)
+                segment = mm[start:] if end == -1 else mm[start:end]
+                segment = segment.decode('utf-8')
+                if '\r' in segment:
+                    # normalize Windows line endings
+                    segment = segment.replace('\r\n', '\n')
+                yield segment
+                start = end
+
+
+def model_from_gem(
+    gem_str: str, model_id: str = 'Unnamed', model_name: str = None,
+    cpu_count: int = 1
+) -> Model:
+    """Create a Honeybee Model from the string contents of a VE GEM file.
+
+    Args:
+        gem_str: Text string representation of the contents of a GEM file.
+        model_id: Text string to be applied as the Model identifier. Typically,
+            this is derived from the GEM file name. (Default: Unnamed).
+        model_name: Text string to be applied as the Model identifier. If None,
+            this will be the same as the model_id. (Default: None).
+        cpu_count: Number of processes to be used for parsing the objects in the
+            GEM file. Using more than one process is only helpful for large GEM
+            files. If None, all the available CPUs will be used. (Default: 1).
+
+    Returns:
+        A Honeybee Model derived from the GEM file contents.
+    """
+    segments = gem_str.split('\nLAYER')[1:]
+    return _model_from_segments(segments, model_id, model_name, cpu_count)
+
+
+def model_from_ies(gem: str, cpu_count: int = 1) -> Model:
     """Create a Honeybee Model from a VE GEM file.
 
     Args:
         gem: String for the path to a VE GEM file.
+        cpu_count: Number of processes to be used for parsing the objects in the
+            GEM file. Using more than one process is only helpful for large GEM
+            files. If None, all the available CPUs will be used. (Default: 1).
 
     Returns:
         A Honeybee Model derived from the GEM file contents.
     """
-    # load the contents of the GEM file
     gem_file = pathlib.Path(gem)
-    file_contents = gem_file.read_text(encoding='utf-8')
-    # return the Honeybee Model
-    return model_from_gem(file_contents, clean_string(gem_file.stem), gem_file.stem)
+    # read the segments of the GEM file and return the Honeybee Model
+    segments = _gem_file_segments(gem_file)
+    return _model_from_segments(
+        segments, clean_string(gem_file.stem), gem_file.stem, cpu_count
+    )
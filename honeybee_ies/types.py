@@ -33,32 +33,15 @@ class GEM_TYPES(enum.Enum):
 
     @classmethod
     def from_info(cls, category: str, type_: int, subtype: int, keyword: str):
-        if category == 1 and subtype == 2001 and type_ == 1 and keyword == 'IES':
-            return cls.Space
-        if category == 1 and subtype == 2002 and type_ == 1 and keyword == 'IES':
-            # unconditioned space
-            return cls.Space
-        elif category == 1 and subtype == 2102 and type_ == 1 and keyword == 'IES':
-            return cls.TranslucentShade
-        elif category == 1 and subtype == 0 and type_ == 2 and keyword == 'IES':
-            return cls.ContextBuilding
-        elif category == 3 and subtype == 0 and type_ == 202 and keyword == 'PVP':
-            return cls.PV
-        elif category == 1 and subtype == 0 and type_ == 3 and keyword == 'IES':
-            return cls.Topography
-        elif category == 1 and subtype == 0 and type_ == 3 and keyword == 'LAN':
-            return cls.Tree
-        elif category == 1 and subtype == 0 and type_ == 4 and keyword == 'IES':
-            return cls.Shade
-        elif category == 1 and subtype == 2101 and type_ == 4 and keyword == 'IES':
-            return cls.Shade_2
-        else:
+        gem_type = _GEM_INFO_TYPES.get((category, type_, subtype, keyword))
+        if gem_type is None:
             print(
                 'Unknown combination of inputs in the input GEM file. Reach out to '
                 'us with a copy of the GEM file and the information below:\n'
                 f'{category}-{type_}-{subtype}-{keyword}'
             )
             return cls.Shade
+        return gem_type
 
     @classmethod
     def from_user_data(cls, user_data: Dict):
@@ -79,7 +62,7 @@ class GEM_TYPES(enum.Enum):
             return cls.Tree
 
     def _get_numeric_values(self, index):
-        return int(self.value.split('-')[index])
+        return _GEM_TYPE_VALUES[self][index]
 
     def category(self):
         return self._get_numeric_values(0)
@@ -98,7 +81,7 @@ class GEM_TYPES(enum.Enum):
             if rgb else self._get_numeric_values(4)
 
     def keyword(self):
-        return self.value.split('-')[-1]
+        return _GEM_TYPE_VALUES[self][-1]
 
     def to_gem(
             self, name: str, identifier: str, vertices: str, faces: str = '',
@@ -106,13 +89,7 @@ class GEM_TYPES(enum.Enum):
         """Get a formatted GEM string."""
         full_name = name if not identifier else f'{name} [{identifier}]'
 
-        gem_header = f'LAYER\n{self.layer()}\n' + \
-            f'COLOUR\n{self.color()}\n' + \
-            f'CATEGORY\n{self.category()}\n' + \
-            f'TYPE\n{self.type()}\n' + \
-            f'SUBTYPE\n{self.subtype()}\n' + \
-            f'COLOURRGB\n{self.color(True)}\n' + \
-            f'{self.keyword()} {full_name}\n'
+        gem_header = f'{_GEM_TYPE_HEADERS[self]}{full_name}\n'
 
         if self.name in ('Tree', 'PV'):
             gem_str = gem_header + f'{vertices}'
@@ -126,3 +103,36 @@ class GEM_TYPES(enum.Enum):
             gem_str += f'\n1\n{vertices_count} 0\n{vertices}'
 
         return gem_str
+
+
+# parse the values of each type only once. the last value is the keyword.
+_GEM_TYPE_VALUES = {
+    gem_type: tuple(int(v) for v in gem_type.value.split('-')[:-1]) +
+    (gem_type.value.split('-')[-1],)
+    for gem_type in GEM_TYPES
+}
+
+# GEM types for (CATEGORY, TYPE, SUBTYPE, KEYWORD) values in GEM files
+_GEM_INFO_TYPES = {
+    (1, 1, 2001, 'IES'): GEM_TYPES.Space,
+    (1, 1, 2002, 'IES'): GEM_TYPES.Space,  # unconditioned space
+    (1, 1, 2102, 'IES'): GEM_TYPES.TranslucentShade,
+    (1, 2, 0, 'IES'): GEM_TYPES.ContextBuilding,
+    (3, 202, 0, 'PVP'): GEM_TYPES.PV,
+    (1, 3, 0, 'IES'): GEM_TYPES.Topography,
+    (1, 3, 0, 'LAN'): GEM_TYPES.Tree,
+    (1, 4, 0, 'IES'): GEM_TYPES.Shade,
+    (1, 4, 2101, 'IES'): GEM_TYPES.Shade_2
+}
+
+# the header of each type in GEM files up to the name of the object
+_GEM_TYPE_HEADERS = {
+    gem_type: f'LAYER\n{gem_type.layer()}\n'
+    f'COLOUR\n{gem_type.color()}\n'
+    f'CATEGORY\n{gem_type.category()}\n'
+    f'TYPE\n{gem_type.type()}\n'
+    f'SUBTYPE\n{gem_type.subtype()}\n'
+    f'COLOURRGB\n{gem_type.color(True)}\n'
+    f'{gem_type.keyword()} '
+    for gem_type in GEM_TYPES
+}
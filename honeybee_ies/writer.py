@@ -1,17 +1,33 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import functools
 import re
 import json
+import os
 import pathlib
 import math
-from typing import List, Union, Dict
+from typing import List, Union, Dict, Tuple, Iterator
 
-from ladybug_geometry.geometry3d import Face3D, Polyface3D, Point3D
+from ladybug_geometry.geometry3d import Face3D, Polyface3D, Point3D, Plane, \
+    Vector3D
 from honeybee.model import Model, Shade, Room, AirBoundary, \
     RoofCeiling, Floor, ShadeMesh
 
-from .reader import Z_AXIS, ROOF_ANGLE_TOLERANCE
 from .types import GEM_TYPES
 
+# formats for the coordinates of the vertices in GEM files
+_VERTEX_FORMAT = '   %.6f    %.6f    %.6f'
+_VERTEX_2D_FORMAT = '   %.6f    %.6f'
+# match any vowel character (case-insensitive), any whitespace, or any
+# non-alphanumeric character in room names
+_VE_ID_PATTERN = re.compile(r"[aeiouAEIOU\s\W]+")
+# angle tolerance for comparing the normal of the faces with their vertex indices
+_ONE_DEGREE = math.radians(1)
+# buffer size for writing GEM files
+_WRITE_BUFFER_SIZE = 1024 * 1024
 
+
+@functools.lru_cache(maxsize=4096)
 def _gen_ve_id(display_name: str) -> str:
     """Generate the VE identifier based on the name of the room.
 
@@ -22,11 +38,8 @@ def _gen_ve_id(display_name: str) -> str:
 
     This method only returns the 2 characters.
     """
-    # Match any vowel character (case-insensitive), any whitespace, or any \
-    # non-alphanumeric character
-    pattern = r"[aeiouAEIOU\s\W]+"
     # Replace matched characters with an empty string
-    identifier = re.sub(pattern, '', display_name).upper()
+    identifier = _VE_ID_PATTERN.sub('', display_name).upper()
     if len(identifier) < 2:
         raise ValueError(
             f'Invalid display name: {display_name}. The display name should at '
@@ -60,43 +73,104 @@ def _convert_room_ids(model: Model) -> Dict:
     return id_mapper
 
 
+def _opening_plane(parent_geo: Face3D) -> Plane:
+    """Get the plane for translating the openings of a face to GEM.
+
+    This is the same plane that Face3D.polygon_in_face creates for the origin and the
+    flip values that GEM uses for openings. It can be calculated once and reused for
+    all the openings of the same face.
+    """
+    normal = parent_geo.plane.n
+    if normal.z in (1, -1):
+        # horizontal faces. the x axis is flipped
+        return Plane(normal, parent_geo.upper_right_corner, Vector3D(-1, 0, 0))
+    proj_y = Vector3D(0, 0, 1).project(normal)
+    proj_x = proj_y.rotate(normal, math.pi / -2)
+    return Plane(normal, parent_geo.lower_left_corner, proj_x)
+
+
+def _xyz_to_xy(plane: Plane, points: List[Point3D]) -> List[Tuple[float, float]]:
+    """Get (x, y) tuples for a list of Point3D in the coordinate system of a plane.
+
+    This returns the same values as calling plane.xyz_to_xy for each point but reads
+    the components of the plane only once and does not create Point2D objects.
+    """
+    (o_x, o_y, o_z), (x_x, x_y, x_z), (y_x, y_y, y_z) = \
+        plane.o.to_array(), plane.x.to_array(), plane.y.to_array()
+    verts_2d = []
+    for pt in points:
+        d_x, d_y, d_z = pt.x - o_x, pt.y - o_y, pt.z - o_z
+        verts_2d.append(
+            (x_x * d_x + x_y * d_y + x_z * d_z, y_x * d_x + y_y * d_y + y_z * d_z)
+        )
+    return verts_2d
+
+
 def _opening_to_ies(
-        parent_geo: Face3D, opening_geos: List[Face3D], opening_type: int = 0) -> str:
+        parent_geo: Face3D, opening_boundaries: List[List[Point3D]],
+        opening_type: int = 0, plane: Plane = None, enforce_right_hand: bool = False
+) -> str:
     """Translate an opening to gem format.
 
     Args:
         parent_geo: Geometry of the parent object.
-        opening_geos: A list of Face3D geometries for openings.
+        opening_boundaries: A list of openings. Each opening is a list of Point3D
+            for the boundary of the opening. The boundaries of the holes can be used
+            directly without creating Face3D objects for them.
         opening_type: An integer between 0-2. 0 for apertures, 1 for doors and 2 for
             holes.
+        plane: An optional plane from _opening_plane for the parent geometry. It will
+            be calculated if not provided.
+        enforce_right_hand: Set to True to reverse the boundaries that are clockwise
+            in the plane of the parent geometry. This gives the same vertices as
+            creating a Face3D from the boundary and the plane of the parent, which
+            is needed for the holes of a face. (Default: False).
 
     Returns:
         A formatted string for the opening.
 
     """
-    if parent_geo.plane.n.z in (1, -1):
-        origin, flip = parent_geo.upper_right_corner, True
-    elif parent_geo.plane.n.angle(Z_AXIS) < ROOF_ANGLE_TOLERANCE:
-        origin, flip = parent_geo.lower_left_corner, True
-    else:
-        origin, flip = parent_geo.lower_left_corner, False
+    plane = plane or _opening_plane(parent_geo)
     openings = []
-    for opening in opening_geos:
-        verts_2d = parent_geo.polygon_in_face(opening, origin, flip)
-        openings.append('{} {}'.format(len(verts_2d), opening_type))
-        openings.append(
-            '\n'.join('   {:.6f}    {:.6f}'.format(v.x, v.y) for v in verts_2d)
-        )
+    for boundary in opening_boundaries:
+        verts_2d = _xyz_to_xy(plane, boundary)
+        if enforce_right_hand:
+            area = 0
+            for (x_1, y_1), (x_2, y_2) in zip(verts_2d[-1:] + verts_2d[:-1], verts_2d):
+                area += x_1 * y_2 - y_1 * x_2
+            if area < 0:
+                verts_2d.reverse()
+        openings.append(f'{len(verts_2d)} {opening_type}')
+        openings.append('\n'.join([_VERTEX_2D_FORMAT % v for v in verts_2d]))
     return '\n'.join(openings)
 
 
 def _vertices_to_ies(vertices: List[Point3D]) -> str:
     """Get a string for vertices in GEM format."""
-    vertices = '\n'.join(
-        '   {:.6f}    {:.6f}    {:.6f}'.format(v.x, v.y, v.z)
-        for v in vertices
-    )
-    return vertices
+    return '\n'.join([_VERTEX_FORMAT % (v.x, v.y, v.z) for v in vertices])
+
+
+def _vertex_ids(count: int) -> List[str]:
+    """Get the 1-based indices of a list of vertices as strings for GEM faces.
+
+    The string for each vertex is created only once and can be looked up by the
+    0-based index of the vertex for all the faces that share it.
+    """
+    return [str(i) for i in range(1, count + 1)]
+
+
+def _shade_face_to_ies(geometry: Face3D, index: List[str]) -> str:
+    """Get a string for a shade face and its holes in GEM format.
+
+    Args:
+        geometry: Geometry of the shade face.
+        index: A list of the indices of the face vertices as strings.
+    """
+    face_str = f'{len(index)} {" ".join(index)}\n'
+    if not geometry.has_holes:
+        return f'{face_str}0'
+    holes = geometry.holes
+    return f'{face_str}{len(holes)}\n{_opening_to_ies(geometry, holes, 2, None, True)}'
 
 
 def _shade_geometry_to_ies(
@@ -105,7 +179,6 @@ def _shade_geometry_to_ies(
     user_data: Dict = None
         ):
 
-    open_count = 0
     faces = []
 
     gem_type = GEM_TYPES.from_user_data(user_data)
@@ -117,10 +190,11 @@ def _shade_geometry_to_ies(
     if gem_type == GEM_TYPES.PV:
         # calculate the bounds of the geometry based and translate it back to
         # GEM format
-        w, h = geometry.boundary_polygon2d.max - geometry.boundary_polygon2d.min
+        polygon, plane = geometry.boundary_polygon2d, geometry.plane
+        w, h = polygon.max - polygon.min
         base = geometry.lower_right_corner
-        yz_rotation = abs(90 - round(math.degrees(geometry.plane.altitude), 6))
-        xy_rotation = abs(360 - round(math.degrees(geometry.plane.azimuth), 6))
+        yz_rotation = abs(90 - round(math.degrees(plane.altitude), 6))
+        xy_rotation = abs(360 - round(math.degrees(plane.azimuth), 6))
         pv_info = f'{round(base.x, 4)} {round(base.y, 4)} {round(base.z, 4)} ' \
             f'{round(w, 4)} {round(h, 4)} ' \
             f'{round(xy_rotation, 4)} {round(yz_rotation, 4)}'
@@ -135,11 +209,12 @@ def _shade_geometry_to_ies(
         y_scale = 3
         z_scale = 8
         tree_type = user_data.get('__gem_tree_type__', 1)
-        w, h = geometry.boundary_polygon2d.max - geometry.boundary_polygon2d.min
+        polygon, plane = geometry.boundary_polygon2d, geometry.plane
+        w, h = polygon.max - polygon.min
         base = (geometry.lower_right_corner + geometry.lower_left_corner) / 2
         # this logic won't work for values larger than 180 but that's for later
-        xy_rotation = abs(90 - round(math.degrees(geometry.plane.azimuth), 6))
-        yz_rotation = round(math.degrees(geometry.plane.altitude), 6)
+        xy_rotation = abs(90 - round(math.degrees(plane.azimuth), 6))
+        yz_rotation = round(math.degrees(plane.altitude), 6)
         tree_info = f'2D Tree {tree_type}\n' \
             f'{round(base.x, 4)} {round(base.y, 4)} {round(base.z, 4)} ' \
             f'{round(w / x_scale, 4)} {round(w / y_scale, 4)} {round(h / z_scale, 4)} ' \
@@ -151,40 +226,45 @@ def _shade_geometry_to_ies(
     if isinstance(geometry, Polyface3D):
         unique_vertices = geometry.vertices
         vertices = _vertices_to_ies(unique_vertices)
-        for face_i, face in zip(geometry.face_indices, geometry.faces):
-            index = [str(v + 1) for v in face_i[0]]
-            face_str = '%d %s\n' % (len(index), ' '.join(index))
-            open_count, openings = 0, []
-            if face.has_holes:
-                sub_faces = [Face3D(hole, face.plane) for hole in face.holes]
-                openings.append(_opening_to_ies(face, sub_faces, 2))
-                open_count += len(sub_faces)
-
-            open_str = '\n' + '\n'.join(openings) if len(openings) != 0 else ''
-            faces.append('%s%d%s' % (face_str, open_count, open_str))
+        vertex_ids = _vertex_ids(len(unique_vertices))
+        faces = [
+            _shade_face_to_ies(face, [vertex_ids[v] for v in face_i[0]])
+            for face_i, face in zip(geometry.face_indices, geometry.faces)
+        ]
         face_count = len(geometry.faces)
     elif isinstance(geometry, ShadeMesh):
         # ShadeMesh
         unique_vertices = geometry.vertices
         vertices = _vertices_to_ies(unique_vertices)
-        for face in geometry.faces:
-            index = [str(v + 1) for v in face]
-            face_str = '%d %s\n' % (len(index), ' '.join(index))
-            faces.append(f'{face_str}0')
-        face_count = len(geometry.faces)
+        vertex_ids = _vertex_ids(len(unique_vertices))
+        mesh_faces = geometry.faces
+        face_sizes = {len(face) for face in mesh_faces}
+        # mesh faces are triangles or quads. format them with a fixed template when
+        # all of them have the same number of vertices
+        if face_sizes == {3}:
+            faces = [
+                '3 %s %s %s\n0' % (vertex_ids[a], vertex_ids[b], vertex_ids[c])
+                for a, b, c in mesh_faces
+            ]
+        elif face_sizes == {4}:
+            faces = [
+                '4 %s %s %s %s\n0' % (
+                    vertex_ids[a], vertex_ids[b], vertex_ids[c], vertex_ids[d]
+                )
+                for a, b, c, d in mesh_faces
+            ]
+        else:
+            for face in mesh_faces:
+                index = [vertex_ids[v] for v in face]
+                face_str = f'{len(index)} {" ".join(index)}\n'
+                faces.append(f'{face_str}0')
+        face_count = len(mesh_faces)
     else:
         # Face 3D
         unique_vertices = geometry.lower_left_counter_clockwise_vertices
         vertices = _vertices_to_ies(unique_vertices)
-        index = [str(v + 1) for v in range(len(unique_vertices))]
-        face_str = '%d %s\n' % (len(index), ' '.join(index))
-        open_count, openings = 0, []
-        if geometry.has_holes:
-            sub_faces = [Face3D(hole, geometry.plane) for hole in geometry.holes]
-            openings.append(_opening_to_ies(geometry, sub_faces, 2))
-            open_count += len(sub_faces)
-        open_str = '\n' + '\n'.join(openings) if len(openings) != 0 else ''
-        faces.append('%s%d%s' % (face_str, open_count, open_str))
+        index = _vertex_ids(len(unique_vertices))
+        faces = [_shade_face_to_ies(geometry, index)]
         face_count = 1
 
     if len(unique_vertices) < 3:
@@ -267,32 +347,28 @@ def shades_to_ies(shades: List[Shade], thickness: float = 0.01) -> str:
     no_groups = []
     for shade in shades:
         user_data = shade.user_data
-        if user_data and '__ies_import__' in user_data \
-                and user_data['__ies_import__']:
-            # ignore the shade face with __ies_import__ key
-            continue
-        try:
-            group_id = shade.user_data['__group_id__']
-        except (TypeError, KeyError):
+        if not user_data:
             no_groups.append(shade)
             continue
+        if user_data.get('__ies_import__'):
+            # ignore the shade face with __ies_import__ key
+            continue
+        if '__group_id__' in user_data:
+            shade_groups.setdefault(user_data['__group_id__'], []).append(shade)
         else:
-            if group_id not in shade_groups:
-                shade_groups[group_id] = [shade]
-            else:
-                shade_groups[group_id].append(shade)
+            no_groups.append(shade)
 
-    single_keys = [key for key, value in shade_groups.items() if len(value) == 1]
-    for key in single_keys:
-        v = shade_groups.pop(key)
-        no_groups.append(v[0])
+    # groups with a single shade are written as single shades
+    group_shades = []
+    for group in shade_groups.values():
+        if len(group) == 1:
+            no_groups.append(group[0])
+        else:
+            group_shades.append(_shade_group_to_ies(group))
 
     single_shades = '\n'.join([_shade_to_ies(shade, thickness) for shade in no_groups])
-    group_shades = '\n'.join(
-        [_shade_group_to_ies(shades) for shades in shade_groups.values()]
-        )
 
-    return '\n'.join((single_shades, group_shades))
+    return '\n'.join((single_shades, '\n'.join(group_shades)))
 
 
 def shade_meshes_to_ies(shades: List[ShadeMesh]) -> str:
@@ -329,39 +405,62 @@ def room_to_ies(room: Room, shade_thickness: float = 0.01) -> str:
     """
 
     def _find_index(vertex: Point3D, vertices: List[Point3D], tolerance=0.01):
-        for c, v in enumerate(vertices):
-            if v.distance_to_point(vertex) <= tolerance:
-                return str(c + 1)
-        else:
-            raise ValueError(f'Failed to find {vertex} in the vertices.')
+        # group the vertices in a grid of cells with the size of tolerance. a vertex
+        # within tolerance of another one is in the same or in a neighboring cell.
+        if not vertex_grid:
+            for c, v in enumerate(vertices):
+                key = (
+                    math.floor(v.x / tolerance), math.floor(v.y / tolerance),
+                    math.floor(v.z / tolerance)
+                )
+                vertex_grid.setdefault(key, []).append(c)
+        c_x, c_y, c_z = math.floor(vertex.x / tolerance), \
+            math.floor(vertex.y / tolerance), math.floor(vertex.z / tolerance)
+        candidates = [
+            c
+            for x in (c_x - 1, c_x, c_x + 1)
+            for y in (c_y - 1, c_y, c_y + 1)
+            for z in (c_z - 1, c_z, c_z + 1)
+            for c in vertex_grid.get((x, y, z), ())
+            if vertices[c].distance_to_point(vertex) <= tolerance
+        ]
+        if candidates:
+            # use the first vertex in the list similar to a linear search
+            return vertex_ids[min(candidates)]
+        raise ValueError(f'Failed to find {vertex} in the vertices.')
 
     # remove new lines from the name
     room.display_name = ' '.join(room.display_name.split())
 
-    unique_vertices = room.geometry.vertices
+    room_geometry, room_faces = room.geometry, room.faces
+    unique_vertices = room_geometry.vertices
     vertices = _vertices_to_ies(unique_vertices)
-    face_count = len(room.faces)
+    vertex_ids = _vertex_ids(len(unique_vertices))
+    vertex_grid = {}  # it is only created if _find_index is used
+    face_count = len(room_faces)
     faces = []
     air_boundary_count = 0
     _key = '__ies_import__'
-    for face_i, face in zip(room.geometry.face_indices, room.faces):
+    for face_i, face in zip(room_geometry.face_indices, room_faces):
+        face_type = face.type
+        is_air_boundary = isinstance(face_type, AirBoundary)
+        if is_air_boundary and _key in (face.user_data or ()):
+            # This air boundary was created during the process of importing holes
+            # from an IES GEM file. We don't write these air boundaries back to GEM.
+            air_boundary_count += 1
+            continue
+        face_geometry = face.geometry
         # ensure that the face_i are aligned with the face vertices
         boundary = tuple(unique_vertices[i] for i in face_i[0])
         rebuilt_face = Face3D(boundary)
-        if not face.geometry.plane.n.angle(rebuilt_face.plane.n) <= math.radians(1):
+        if not face_geometry.plane.n.angle(rebuilt_face.plane.n) <= _ONE_DEGREE:
             # face indices are reversed from Face3D objects
             face_i = [list(reversed(pt_i)) for pt_i in face_i]
-        if isinstance(face.type, AirBoundary) and face.user_data \
-                and _key in face.user_data:
-            # This air boundary was created during the process of importing holes
-            # from an IES GEM file. We don't write these air boundaries back to GEM.
-            air_boundary_count += 1
-            continue
-        if isinstance(face.type, (RoofCeiling, Floor)) and face.geometry.has_holes:
+        if face_geometry.has_holes and isinstance(face_type, (RoofCeiling, Floor)):
             # IES doesn't like rooms with holes in them. We need to break the face
             # into smaller faces
             try:
-                fgs = face.geometry.split_through_holes()
+                fgs = face_geometry.split_through_holes()
             except AssertionError as e:
                 if 'There must be at least 3 vertices for a Polygon2D' not in str(e):
                     raise AssertionError(e)
@@ -370,8 +469,8 @@ def room_to_ies(room: Room, shade_thickness: float = 0.01) -> str:
                     f'Failed to resolve the holes for {room.display_name}. Check the '
                     'input model to ensure the holes are not outside the parent face.'
                 )
-                fgs = [face.geometry]
-                indexes = [[str(v + 1) for v in face_i[0]]]
+                fgs = [face_geometry]
+                indexes = [[vertex_ids[v] for v in face_i[0]]]
             else:
                 face_count += len(fgs) - 1
                 indexes = [
@@ -381,31 +480,34 @@ def room_to_ies(room: Room, shade_thickness: float = 0.01) -> str:
                     ] for fg in fgs
                 ]
         else:
-            fgs = [face.geometry]
-            indexes = [[str(v + 1) for v in face_i[0]]]
+            fgs = [face_geometry]
+            indexes = [[vertex_ids[v] for v in face_i[0]]]
 
+        apertures, doors = face.apertures, face.doors
         for index, fg in zip(indexes, fgs):
-            face_str = '%d %s\n' % (len(index), ' '.join(index))
+            face_str = f'{len(index)} {" ".join(index)}\n'
             open_count, openings = 0, []
-            if isinstance(face.type, AirBoundary):
+            fg_holes = fg.holes
+            if is_air_boundary or fg_holes or apertures or doors:
+                # calculate the plane for the openings only once
+                plane = _opening_plane(fg)
+            if is_air_boundary:
                 # add the face itself as the hole
-                sub_faces = [Face3D(fg.vertices, fg.plane)]
-                openings.append(_opening_to_ies(fg, sub_faces, 2))
+                openings.append(_opening_to_ies(fg, [fg.vertices], 2, plane, True))
                 open_count += 1
-            elif fg.has_holes:
-                sub_faces = [Face3D(hole, fg.plane) for hole in fg.holes]
-                openings.append(_opening_to_ies(fg, sub_faces, 2))
+            elif fg_holes:
+                openings.append(_opening_to_ies(fg, fg_holes, 2, plane, True))
+                open_count += len(fg_holes)
+            if apertures:
+                sub_faces = [ap.geometry.boundary for ap in apertures]
+                openings.append(_opening_to_ies(fg, sub_faces, 0, plane))
                 open_count += len(sub_faces)
-            if len(face.apertures) != 0:
-                sub_faces = [ap.geometry for ap in face.apertures]
-                openings.append(_opening_to_ies(fg, sub_faces, 0))
-                open_count += len(sub_faces)
-            if len(face.doors) != 0:
-                sub_faces = [dr.geometry for dr in face.doors]
-                openings.append(_opening_to_ies(fg, sub_faces, 1))
+            if doors:
+                sub_faces = [dr.geometry.boundary for dr in doors]
+                openings.append(_opening_to_ies(fg, sub_faces, 1, plane))
                 open_count += len(sub_faces)
             open_str = '\n' + '\n'.join(openings) if len(openings) != 0 else ''
-            faces.append('%s%d%s' % (face_str, open_count, open_str))
+            faces.append(f'{face_str}{open_count}{open_str}')
 
     space = GEM_TYPES.Space.to_gem(
         name=room.display_name, identifier=room.identifier,
@@ -416,7 +518,7 @@ def room_to_ies(room: Room, shade_thickness: float = 0.01) -> str:
 
     # collect all the shades from room
     shades = [shade for shade in room.shades]
-    for face in room.faces:
+    for face in room_faces:
         for aperture in face.apertures:
             for shade in aperture.shades:
                 shades.append(shade)
@@ -430,7 +532,50 @@ def room_to_ies(room: Room, shade_thickness: float = 0.01) -> str:
         return space
 
 
-def model_to_gem(model: Model, shade_thickness: float = 0.0):
+def _rooms_to_ies(
+        rooms: List[Room], shade_thickness: float = 0.0, cpu_count: int = 1
+) -> Iterator[str]:
+    """Convert a list of Honeybee Rooms to GEM strings.
+
+    The rooms are translated one at a time as the strings are consumed so a caller
+    that writes them to a file does not need to keep all of them in memory. When
+    several processes are used, the strings are collected before they are yielded.
+
+    Args:
+        rooms: A list of Honeybee Rooms.
+        shade_thickness: The thickness of the shade faces in meters.
+        cpu_count: Number of processes to be used for translating the rooms. If None,
+            all the available CPUs will be used. (Default: 1).
+
+    Yields:
+        A formatted string for each room in the same order as the input rooms.
+    """
+    if cpu_count is None:
+        cpu_count = os.cpu_count() or 1
+    workers = min(cpu_count, len(rooms))
+    if workers > 1:
+        chunksize = max(1, len(rooms) // (4 * workers))
+        to_ies = functools.partial(room_to_ies, shade_thickness=shade_thickness)
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                rooms_data = list(executor.map(to_ies, rooms, chunksize=chunksize))
+        except (OSError, NotImplementedError, BrokenProcessPool) as error:
+            # processes are not available in this environment or a worker was
+            # terminated before the rooms were translated; translate them serially
+            print(
+                f'Failed to translate the rooms in parallel: {error!r}. '
+                'Translating them serially.'
+            )
+        else:
+            yield from rooms_data
+            return
+    for room in rooms:
+        yield room_to_ies(room, shade_thickness=shade_thickness)
+
+
+def model_to_gem(
+    model: Model, shade_thickness: float = 0.0, cpu_count: int = 1, copy: bool = True
+        ) -> str:
     """Generate an IES GEM string representation of a Model.
 
     Args:
@@ -439,28 +584,37 @@ def model_to_gem(model: Model, shade_thickness: float = 0.0):
             used to extrude shades with no group id. IES doesn't consider the effect of
             shades with no thickness in SunCalc. This function extrudes the geometry to
             create a closed volume for the shade. (Default: 0.0).
+        cpu_count: Number of processes to be used for translating the rooms. Using
+            more than one process is only helpful for models with many rooms. If None,
+            all the available CPUs will be used. (Default: 1).
+        copy: A boolean to note whether the input model should be duplicated before
+            the translation. The identifiers and the display names of the rooms are
+            changed during the translation. Set this to False to skip duplicating
+            large models that are not used after the translation. Models that are
+            not in Meters are always duplicated. (Default: True).
 
     Returns:
         Text string representation of the contents of a GEM file derived from
         the input model.
     """
     # ensure model is in metric and has identifiers that are acceptable for GEM
-    model = model.duplicate()
-    model.convert_to_units(units='Meters')
+    if copy or model.units != 'Meters':
+        model = model.duplicate()
+        model.convert_to_units(units='Meters')
     _convert_room_ids(model)
     # create and return the GEM file string
     header = 'COM GEM data file exported by Pollination\\nANT'
-    rooms_data = [room_to_ies(room, shade_thickness=shade_thickness)
-                  for room in model.rooms]
-    context_shades = shades_to_ies(model.shades, thickness=shade_thickness)
-    mesh_shades = shade_meshes_to_ies(model.shade_meshes)
-    gem_data = [header] + rooms_data + [context_shades, mesh_shades]
+    # collect all the parts in one list and join them only once
+    gem_data = [header]
+    gem_data.extend(_rooms_to_ies(model.rooms, shade_thickness, cpu_count))
+    gem_data.append(shades_to_ies(model.shades, thickness=shade_thickness))
+    gem_data.append(shade_meshes_to_ies(model.shade_meshes))
     return '\n'.join(gem_data)
 
 
 def model_to_ies(
     model: Model, folder: str = '.', name: str = None, shade_thickness: float = 0.0,
-    write_id_mapper=True
+    write_id_mapper=True, cpu_count: int = 1, copy: bool = True
         ) -> pathlib.Path:
     """Export a honeybee model to an IES GEM file.
 
@@ -476,19 +630,27 @@ def model_to_ies(
         write_id_mapper: A boolean to indicate if the id mapper file should be written
             next to the gem file. It is a JSON file that maps the original identifier
             of the rooms in the honeybee model to the new identifier in GEM file.
+        cpu_count: Number of processes to be used for translating the rooms. Using
+            more than one process is only helpful for models with many rooms. If None,
+            all the available CPUs will be used. (Default: 1).
+        copy: A boolean to note whether the input model should be duplicated before
+            the translation. The identifiers and the display names of the rooms are
+            changed during the translation. Set this to False to skip duplicating
+            large models that are not used after the translation. Models that are
+            not in Meters are always duplicated. (Default: True).
 
     Returns:
         Path to exported GEM file.
     """
     # ensure model is in metric and has identifiers that are acceptable for GEM
-    model = model.duplicate()
-    model.convert_to_units(units='Meters')
+    if copy or model.units != 'Meters':
+        model = model.duplicate()
+        model.convert_to_units(units='Meters')
     id_mapper = _convert_room_ids(model)
 
     # get the text for the GEM file contents
     header = 'COM GEM data file exported by Pollination\nANT\n'
-    rooms_data = [room_to_ies(room, shade_thickness=shade_thickness)
-                  for room in model.rooms]
+    rooms_data = _rooms_to_ies(model.rooms, shade_thickness, cpu_count)
     context_shades = shades_to_ies(model.shades, thickness=shade_thickness)
     mesh_shades = shade_meshes_to_ies(model.shade_meshes)
 
@@ -499,15 +661,31 @@ def model_to_ies(
     out_folder = pathlib.Path(folder)
     out_folder.mkdir(parents=True, exist_ok=True)
     out_file = out_folder.joinpath(name)
-    with out_file.open('w', encoding='utf-8') as outf:
-        outf.write(header)
-        outf.write('\n'.join(rooms_data) + '\n')
-        outf.write(context_shades)
-        outf.write(mesh_shades)
+    # the rooms are translated while the file is written. write to a temporary file
+    # first so a failed translation doesn't leave a truncated GEM file behind
+    temp_file = out_folder.joinpath(f'.{name}.{os.getpid()}.tmp')
+    try:
+        with temp_file.open(
+                'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as outf:
+            outf.write(header)
+            # translate and write the rooms one by one instead of keeping all of them
+            # in memory and joining them into another large string
+            for room_data in rooms_data:
+                outf.write(room_data)
+                outf.write('\n')
+            if not model.rooms:
+                outf.write('\n')
+            outf.write(context_shades)
+            outf.write(mesh_shades)
+        os.replace(temp_file, out_file)
+    except BaseException:
+        if temp_file.exists():
+            temp_file.unlink()
+        raise
 
     if write_id_mapper:
         mapper_name = f'{name[:-4]}.im.json'
         mapper_out_file = out_folder.joinpath(mapper_name)
-        mapper_out_file.write_text(json.dumps(id_mapper))
+        mapper_out_file.write_text(json.dumps(id_mapper, separators=(',', ':')))
 
     return out_file
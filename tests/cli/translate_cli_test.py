@@ -2,15 +2,15 @@ import os
 
 from click.testing import CliRunner
 
-from ladybug.futil import nukedir
+from honeybee.model import Model
 
-from honeybee_ies.cli.translate import model_to_gem_cli
+from honeybee_ies.cli.translate import model_to_gem_cli, gem_to_model_cli
 
 
-def test_model_to_gem():
+def test_model_to_gem(tmp_path):
     runner = CliRunner()
     input_hb_model = './tests/assets/sample_model_45.hbjson'
-    folder = './tests/assets/temp'
+    folder = tmp_path.as_posix()
     name = 'cli_test_45'
 
     result = runner.invoke(
@@ -19,4 +19,18 @@ def test_model_to_gem():
     print(result.output)
     assert result.exit_code == 0
     assert os.path.isfile(os.path.join(folder, f'{name}.gem'))
-    nukedir(folder, True)
+
+
+def test_gem_to_model(tmp_path):
+    runner = CliRunner()
+    input_gem = './tests/assets/pv.gem'
+    folder = tmp_path.as_posix()
+    name = 'cli_test_pv'
+
+    result = runner.invoke(
+        gem_to_model_cli, [input_gem, '--folder', folder, '--name', name]
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    model = Model.from_hbjson(os.path.join(folder, f'{name}.hbjson'))
+    assert len(model.shades) == 1
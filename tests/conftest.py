@@ -0,0 +1,25 @@
+import pytest
+from honeybee.model import Model
+
+
+@pytest.fixture(scope='session')
+def load_model():
+    """Load honeybee models from the test assets only once per test session.
+
+    The writer duplicates the input model before translating it so the same model can
+    be shared between the tests. Load a new model for tests that change the model.
+    """
+    models = {}
+
+    def _load_model(in_file):
+        if in_file not in models:
+            models[in_file] = Model.from_hbjson(in_file)
+        return models[in_file]
+
+    return _load_model
+
+
+@pytest.fixture(scope='session')
+def out_folder(tmp_path_factory):
+    """Temporary folder for the files that are written during the tests."""
+    return tmp_path_factory.mktemp('gem')
@@ -1,4 +1,7 @@
+import pytest
+
 from honeybee.model import Model
+from honeybee.room import Room
 from honeybee_ies.writer import model_to_gem
 
 
@@ -9,3 +12,16 @@ def test_model():
     # check that the model can be translated to GEM
     gem_str = model_to_gem(model)
     assert isinstance(gem_str, str)
+
+
+def test_check_for_extension():
+    room = Room.from_box('Room_1', 5, 10, 3)
+    model = Model('Test_Model', rooms=[room])
+    assert model.properties.ies.check_for_extension() == ''
+
+    # duplicate identifiers are reported before the rest of the checks
+    duplicate_room = Room.from_box('Room_1', 5, 10, 3, origin=room.max)
+    model.add_room(duplicate_room)
+    with pytest.raises(ValueError):
+        model.properties.ies.check_for_extension()
+    assert model.properties.ies.check_for_extension(raise_exception=False) != ''
@@ -1,3 +1,6 @@
+from concurrent.futures.process import BrokenProcessPool
+
+import honeybee_ies.reader
 from honeybee_ies.reader import model_from_ies
 
 
@@ -35,3 +38,69 @@ def test_non_ascii():
     in_file = './tests/assets/room_non_ascii.gem'
     model = model_from_ies(in_file)
     assert model.rooms[0].display_name == 'اتاق خواب'
+
+
+def test_parallel_parsing():
+    in_file = './tests/assets/tree.gem'
+    model = model_from_ies(in_file)
+    parallel_model = model_from_ies(in_file, cpu_count=2)
+    assert len(parallel_model.shades) == len(model.shades)
+    assert len(parallel_model.rooms) == len(model.rooms)
+    face_ids = [face.identifier for face in parallel_model.faces]
+    assert len(face_ids) == len(set(face_ids))
+
+
+def test_parallel_parsing_fallback(monkeypatch, capsys):
+    class _BrokenExecutor:
+        def __init__(self, *args, **kwargs):
+            raise BrokenProcessPool('A child process terminated abruptly.')
+
+    monkeypatch.setattr(honeybee_ies.reader, 'ProcessPoolExecutor', _BrokenExecutor)
+    in_file = './tests/assets/tree.gem'
+    model = model_from_ies(in_file, cpu_count=2)
+    assert len(model.shades) == len(model_from_ies(in_file).shades)
+    assert 'Parsing them serially' in capsys.readouterr().out
+
+
+def test_room_with_holes():
+    in_file = './tests/assets/room_with_holes.gem'
+    model = model_from_ies(in_file)
+    room = model.rooms[0]
+    assert len(room.faces) == 8
+    air_boundaries = [f for f in room.faces if f.type.name == 'AirBoundary']
+    assert len(air_boundaries) == 2
+    assert all(f.user_data['__ies_import__'] for f in air_boundaries)
+    wall = [f for f in room.faces if f.geometry.has_holes][0]
+    assert len(wall.geometry.holes) == 2
+    assert wall.area == 16
+
+
+def test_context_building_faces():
+    in_file = './tests/assets/context_building_faces.gem'
+    model = model_from_ies(in_file)
+    # the building has a face with more than 4 edges and can't be a shade mesh
+    assert len(model.shade_meshes) == 0
+    assert len(model.shades) == 7
+    assert all(shade.is_detached for shade in model.shades)
+
+
+def test_context_building_faces_quad_first():
+    in_file = './tests/assets/context_building_faces_quad_first.gem'
+    model = model_from_ies(in_file)
+    # the faces before the pentagons should not be mixed with the shades
+    assert len(model.shade_meshes) == 0
+    assert len(model.shades) == 7
+    assert all(shade.is_detached for shade in model.shades)
+
+
+def test_opening_edge_snapping():
+    in_file = './tests/assets/opening_edge_snapping.gem'
+    model = model_from_ies(in_file)
+    bowtie, notched = model.rooms[0].faces
+    # the small lobe of the bowtie is clockwise. the first move is outside the face
+    # and the vertices on the edge are moved in the reverse direction.
+    vertices = bowtie.apertures[0].geometry.vertices
+    assert [round(v.x, 3) for v in vertices] == [9, 9.995, 9.995, 9]
+    # none of the moved vertices are inside the notched face. the vertex is unchanged.
+    vertices = notched.apertures[0].geometry.vertices
+    assert vertices[1].x == 4 and vertices[1].z == 1
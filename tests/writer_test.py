@@ -1,32 +1,30 @@
-import pathlib
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
 from honeybee.model import Model
-from honeybee_ies.writer import model_to_ies
+import honeybee_ies.writer
+from honeybee_ies.writer import model_to_ies, model_to_gem
 
 
-def test_model():
+def test_model(load_model, out_folder):
     in_file = './tests/assets/revit_sample_model.hbjson'
-    out_folder = pathlib.Path('./tests/assets/temp')
-    out_folder.mkdir(parents=True, exist_ok=True)
-    model = Model.from_hbjson(in_file)
+    model = load_model(in_file)
     outf = model_to_ies(model, out_folder.as_posix(), name='revit_sample_model')
     assert outf.exists()
 
 
-def test_room_shades():
+def test_room_shades(load_model, out_folder):
     in_file = './tests/assets/lab_building.hbjson'
-    out_folder = pathlib.Path('./tests/assets/temp')
-    out_folder.mkdir(parents=True, exist_ok=True)
-    model = Model.from_hbjson(in_file)
+    model = load_model(in_file)
     outf = model_to_ies(model, out_folder.as_posix(), name='lab_building')
     assert outf.exists()
     assert 'TYPE\n4' in outf.read_text()
 
 
-def test_air_boundary():
+def test_air_boundary(load_model, out_folder):
     in_file = './tests/assets/room_with_air_boundary.hbjson'
-    out_folder = pathlib.Path('./tests/assets/temp')
-    out_folder.mkdir(parents=True, exist_ok=True)
-    model = Model.from_hbjson(in_file)
+    model = load_model(in_file)
     outf = model_to_ies(model, out_folder.as_posix(), name='room_with_air_boundary')
     assert outf.exists()
     ab_str = '4 2\n' \
@@ -38,11 +36,9 @@ def test_air_boundary():
     assert ab_str in outf.read_text()
 
 
-def test_display_name_clean_up():
+def test_display_name_clean_up(load_model, out_folder):
     in_file = './tests/assets/multiline_name_test.hbjson'
-    out_folder = pathlib.Path('./tests/assets/temp')
-    out_folder.mkdir(parents=True, exist_ok=True)
-    model = Model.from_hbjson(in_file)
+    model = load_model(in_file)
     outf = model_to_ies(model, out_folder.as_posix(), name='multiline_name_test')
     assert outf.exists()
     ab_str = 'IES first line second line [FR000000]\n'
@@ -50,11 +46,9 @@ def test_display_name_clean_up():
     assert ab_str in outf.read_text()
 
 
-def test_0_shade_thickness():
+def test_0_shade_thickness(load_model, out_folder):
     in_file = './tests/assets/single_face_shade.hbjson'
-    out_folder = pathlib.Path('./tests/assets/temp')
-    out_folder.mkdir(parents=True, exist_ok=True)
-    model = Model.from_hbjson(in_file)
+    model = load_model(in_file)
     outf = model_to_ies(
         model, out_folder.as_posix(), name='zero_shade_thickness', shade_thickness=0
     )
@@ -71,11 +65,9 @@ def test_0_shade_thickness():
     assert ab_str in outf.read_text()
 
 
-def test_shade_with_holes():
+def test_shade_with_holes(load_model, out_folder):
     in_file = './tests/assets/shade_with_holes.hbjson'
-    out_folder = pathlib.Path('./tests/assets/temp')
-    out_folder.mkdir(parents=True, exist_ok=True)
-    model = Model.from_hbjson(in_file)
+    model = load_model(in_file)
     outf = model_to_ies(model, out_folder.as_posix(), name='shade_with_holes')
     assert outf.exists()
 
@@ -93,11 +85,9 @@ def test_shade_with_holes():
     assert hole_str in outf.read_text()
 
 
-def test_model_with_holes():
+def test_model_with_holes(load_model, out_folder):
     in_file = './tests/assets/model_with_holes.hbjson'
-    out_folder = pathlib.Path('./tests/assets/temp')
-    out_folder.mkdir(parents=True, exist_ok=True)
-    model = Model.from_hbjson(in_file)
+    model = load_model(in_file)
     outf = model_to_ies(model, out_folder.as_posix(), name='model_with_holes')
     assert outf.exists()
 
@@ -106,11 +96,9 @@ def test_model_with_holes():
     assert room_str in outf.read_text()
 
 
-def test_model_with_pv():
+def test_model_with_pv(load_model, out_folder):
     in_file = './tests/assets/pv.hbjson'
-    out_folder = pathlib.Path('./tests/assets/temp')
-    out_folder.mkdir(parents=True, exist_ok=True)
-    model = Model.from_hbjson(in_file)
+    model = load_model(in_file)
     outf = model_to_ies(model, out_folder.as_posix(), name='pv')
     assert outf.exists()
 
@@ -122,11 +110,9 @@ def test_model_with_pv():
     assert pv_str in outf.read_text()
 
 
-def test_model_with_tree():
+def test_model_with_tree(load_model, out_folder):
     in_file = './tests/assets/tree.hbjson'
-    out_folder = pathlib.Path('./tests/assets/temp')
-    out_folder.mkdir(parents=True, exist_ok=True)
-    model = Model.from_hbjson(in_file)
+    model = load_model(in_file)
     outf = model_to_ies(model, out_folder.as_posix(), name='tree')
     assert outf.exists()
 
@@ -137,11 +123,9 @@ def test_model_with_tree():
     assert tree_str in outf.read_text()
 
 
-def test_model_with_topo():
+def test_model_with_topo(load_model, out_folder):
     in_file = './tests/assets/topographical_shade.hbjson'
-    out_folder = pathlib.Path('./tests/assets/temp')
-    out_folder.mkdir(parents=True, exist_ok=True)
-    model = Model.from_hbjson(in_file)
+    model = load_model(in_file)
     outf = model_to_ies(model, out_folder.as_posix(), name='topographical_shade')
     assert outf.exists()
 
@@ -171,11 +155,9 @@ def test_model_with_topo():
     assert topo_str in outf.read_text()
 
 
-def test_model_with_translucent_shade():
+def test_model_with_translucent_shade(load_model, out_folder):
     in_file = './tests/assets/translucent_shade.hbjson'
-    out_folder = pathlib.Path('./tests/assets/temp')
-    out_folder.mkdir(parents=True, exist_ok=True)
-    model = Model.from_hbjson(in_file)
+    model = load_model(in_file)
     outf = model_to_ies(model, out_folder.as_posix(), name='translucent_shade')
     assert outf.exists()
 
@@ -196,11 +178,9 @@ def test_model_with_translucent_shade():
     assert topo_str in outf.read_text()
 
 
-def test_model_with_shade_mesh():
+def test_model_with_shade_mesh(load_model, out_folder):
     in_file = './tests/assets/shade_mesh_example.hbjson'
-    out_folder = pathlib.Path('./tests/assets/temp')
-    out_folder.mkdir(parents=True, exist_ok=True)
-    model = Model.from_hbjson(in_file)
+    model = load_model(in_file)
     outf = model_to_ies(model, out_folder.as_posix(), name='shades_mesh')
     assert outf.exists()
 
@@ -211,13 +191,53 @@ def test_model_with_shade_mesh():
     assert '182 200' in content
 
 
-def test_model_non_ascii():
+def test_model_non_ascii(load_model, out_folder):
     in_file = './tests/assets/room_non_ascii.hbjson'
-    out_folder = pathlib.Path('./tests/assets/temp')
-    out_folder.mkdir(parents=True, exist_ok=True)
-    model = Model.from_hbjson(in_file)
+    model = load_model(in_file)
     outf = model_to_ies(model, out_folder.as_posix(), name='room_non_ascii')
     assert outf.exists()
 
     content = outf.read_text(encoding='utf-8')
     assert 'IES اتاق خواب [' in content
+
+
+def test_parallel_translation(load_model):
+    in_file = './tests/assets/lab_building.hbjson'
+    model = load_model(in_file)
+    gem_str = model_to_gem(model)
+    parallel_gem_str = model_to_gem(model, cpu_count=2)
+    assert parallel_gem_str == gem_str
+
+
+def test_parallel_translation_fallback(load_model, monkeypatch, capsys):
+    class _BrokenExecutor:
+        def __init__(self, *args, **kwargs):
+            raise BrokenProcessPool('A child process terminated abruptly.')
+
+    in_file = './tests/assets/lab_building.hbjson'
+    model = load_model(in_file)
+    gem_str = model_to_gem(model)
+    monkeypatch.setattr(honeybee_ies.writer, 'ProcessPoolExecutor', _BrokenExecutor)
+    assert model_to_gem(model, cpu_count=2) == gem_str
+    assert 'Translating them serially' in capsys.readouterr().out
+
+
+def test_failed_translation_leaves_no_file(load_model, out_folder, monkeypatch):
+    in_file = './tests/assets/lab_building.hbjson'
+    model = load_model(in_file)
+
+    def _failed_room_to_ies(room, shade_thickness=0.0):
+        raise ValueError(f'Failed to translate {room.display_name}.')
+
+    monkeypatch.setattr(honeybee_ies.writer, 'room_to_ies', _failed_room_to_ies)
+    with pytest.raises(ValueError):
+        model_to_ies(model, out_folder.as_posix(), name='failed_translation')
+    assert list(out_folder.glob('*failed_translation*')) == []
+
+
+def test_translation_without_copy(load_model):
+    in_file = './tests/assets/lab_building.hbjson'
+    gem_str = model_to_gem(load_model(in_file))
+    # load a new model since the translation changes the model without a copy
+    model = Model.from_hbjson(in_file)
+    assert model_to_gem(model, copy=False) == gem_str